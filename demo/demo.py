@@ -5,8 +5,9 @@ import sys
 sys.path.append('.')
 import random
 import time
-from xprint.colors import colorize, is_256color_terminal
+from xprint.colors import is_256color_terminal
 from xprint.flush import Flushing
+from xprint.gradient import gradient_lines
 
 
 PATTERN = """
@@ -25,7 +26,7 @@ def generate_random_color():
     r = random.choice(cs)
     g = random.choice(cs)
     b = random.choice(cs)
-    return f'({r},{g},{b})'
+    return (r, g, b)
 
 class Pattern(object):
     def __init__(self, pstr: str) -> None:
@@ -53,12 +54,12 @@ def print_xprint_ascii(pattern):
     print('is_256color_terminal:', is_256color_terminal())
     pat = Pattern(pattern)
     while True:
-        color = generate_random_color()
+        stops = [generate_random_color(), generate_random_color()]
         for i in range(pat.width):
             lines = pat.step()
             with Flushing(pat.height) as f:
-                for line in lines:
-                    f.print(colorize(line, fg=eval(color)))
+                for line in gradient_lines(lines, stops, quantize=8):
+                    f.print(line)
             time.sleep(0.15)
             
 
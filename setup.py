@@ -17,6 +17,6 @@ setup(
     author_email='niu1187203155@gmail.com',
     packages=find_packages(),
     include_package_data=True,
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     install_requires=[], 
 )
\ No newline at end of file
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('.')
+from xprint.colors import colorize
+from xprint.ansi_code import ESC, RESET
+from xprint import gradient as G
+
+
+def test_gradient_endpoints():
+    s = G.gradient('ab', [(255, 0, 0), (0, 0, 255)])
+    assert s == colorize('a', fg=(255, 0, 0))[:-len(RESET)] \
+        + colorize('b', fg=(0, 0, 255))
+    assert G.gradient('xprint', ['red', '#0000ff']) == \
+        G.gradient('xprint', [(255, 0, 0), (0, 0, 255)])
+
+
+def test_run_coalescing():
+    s = G.gradient('x' * 100, [(0, 0, 0), (0, 0, 10)], quantize=8)
+    assert s.count(ESC) - 1 <= 3
+    s = G.gradient('x' * 10, ['red'])
+    assert s == colorize('x' * 10, fg=(255, 0, 0))
+
+
+def test_interpolate_python_matches_numpy():
+    stops = ((255, 0, 0), (0, 255, 0), (0, 0, 255))
+    np = G.np
+    G.np = None
+    try:
+        py = G._interpolate(37, stops, 4)
+    finally:
+        G.np = np
+    if np is not None:
+        assert py == G._interpolate(37, stops, 4)
+    assert py[0] == (255, 0, 0)
+    assert py[-1] == (0, 0, 255)
+
+
+def test_cache_and_lines():
+    G._RUN_CACHE.clear()
+    lines = ['abc', 'a', '']
+    out = G.gradient_lines(lines, [(255, 0, 0), (0, 0, 255)])
+    assert len(G._RUN_CACHE) == 1
+    assert out[2] == ''
+    assert out[1] == G.gradient('abc', [(255, 0, 0), (0, 0, 255)])[:len(out[1]) - len(RESET)] + RESET
+    out = G.gradient_lines(lines, [(255, 0, 0), (0, 0, 255)], vertical=True)
+    assert out[0] == colorize('abc', fg=(255, 0, 0))
+    assert out[1] == colorize('a', fg=(128, 0, 128))
+    assert out[2] == ''
+
+
+def test_longer_than_width():
+    s = G.gradient('abcdef', [(255, 0, 0), (0, 0, 255)], width=2)
+    assert s.endswith('bcdef' + RESET)
+
+
+def test_invalid_stop():
+    try:
+        G.gradient('x', ['no_such_color'])
+    except ValueError as e:
+        assert "'no_such_color'" in str(e)
+    else:
+        assert False
+
+
+def test_metrics():
+    from xprint import metrics
+    metrics.enable()
+    metrics.reset()
+    G._RUN_CACHE.clear()
+    s = G.gradient('ab', [(255, 0, 0), (0, 0, 255)])
+    G.gradient_lines(['ab', 'a'], [(255, 0, 0), (0, 0, 255)])
+    c = metrics.snapshot()['counters']
+    assert c['colorize_calls'] == 0
+    assert c['style_cache_hits'] == 0 and c['style_cache_misses'] == 0
+    assert c['gradient_calls'] == 3
+    assert c['gradient_cache_misses'] == 1 and c['gradient_cache_hits'] == 2
+    assert c['colorize_bytes'] >= len(s)
+    metrics.disable()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import io
+import sys
+sys.path.append('.')
+from xprint import metrics
+from xprint.colors import colorize
+from xprint.flush import Flushing
+from xprint.tablize import tablize
+
+
+def test_disabled():
+    metrics.disable()
+    colorize('xprint', fg=(255, 0, 0))
+    assert metrics.snapshot() == {}
+
+
+def test_colorize_counters():
+    metrics.enable()
+    metrics.reset()
+    a = colorize('xprint', fg=(1, 2, 3), sgr='bold')
+    b = colorize('xprint', fg=(1, 2, 3), sgr='bold')
+    assert a == b
+    c = metrics.snapshot()['counters']
+    assert c['colorize_calls'] == 2
+    assert c['style_cache_hits'] >= 1
+    assert c['colorize_bytes'] == len(a) + len(b)
+    assert c['colorize_escape_bytes'] == len(a) + len(b) - 2 * len('xprint')
+    assert c['bytes_written'] == 0
+    metrics.disable()
+
+
+def test_write_counters(capsys):
+    metrics.enable()
+    metrics.reset()
+    s = colorize('xprint', fg=(1, 2, 3))
+    with Flushing(2) as f:
+        f.print(s)
+        f.print('ab')
+    out = capsys.readouterr().out
+    c = metrics.snapshot()['counters']
+    assert c['bytes_written'] == len(out.encode('utf-8'))
+    assert c['escape_bytes_written'] == len(out) - len('xprint\nab\r')
+    metrics.disable()
+
+
+def test_frames_and_cells():
+    metrics.enable()
+    metrics.reset()
+    with Flushing(1) as f:
+        f.print('xprint')
+    try:
+        with Flushing(1) as f:
+            f.print('x')
+            f.print('y')
+    except IndexError:
+        pass
+    tablize(['a', 'b', 'c'], cols=2)
+    snap = metrics.snapshot()
+    assert snap['counters']['frames_rendered'] == 1
+    assert snap['counters']['frames_dropped'] == 1
+    assert snap['counters']['tablize_cells'] == 4
+    assert snap['histograms']['frame_render_ms']['count'] == 1
+    metrics.disable()
+
+
+def test_dump():
+    metrics.enable()
+    out = io.StringIO()
+    metrics.dump(out)
+    assert '"counters"' in out.getvalue()
+    metrics.disable()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('.')
+from xprint import metrics
+from xprint.progress import track, Progress, _format_time
+
+
+def test_track(capsys):
+    items = list(track(range(100000), desc='work'))
+    assert items == list(range(100000))
+    out = capsys.readouterr().out
+    # redraws are bounded by the refresh rate, not by the number of items
+    assert out.count('\r') < 100
+    assert out.split('\n')[-2].startswith('\r')
+    # the final frame is the last one drawn over the line
+    last = out.rsplit('\r', 1)[-1]
+    assert last.startswith('work: |' + '#' * 30 + '| 100% 100000/100000 [')
+    assert out.endswith('\n')
+
+
+def test_stride_adapts(capsys):
+    bar = Progress().add(total=10 ** 6)
+    for _ in range(10 ** 6):
+        bar.update()
+    assert bar._stride > 1
+    bar.close()
+    capsys.readouterr()
+
+
+def test_stacked(capsys):
+    with Progress(refresh_rate=1000) as p:
+        a = p.add(total=5, desc='a')
+        for _ in p.track(range(5), desc='b'):
+            a.update()
+        assert p.bars == [a]
+    assert p.closed
+    out = capsys.readouterr().out
+    assert 'b: ' in out and '5/5' in out
+
+
+def test_nested_refresh_bounded(capsys):
+    metrics.enable()
+    metrics.reset()
+    try:
+        with Progress(refresh_rate=10) as p:
+            for _ in p.track(range(2000), desc='epoch'):
+                for _ in p.track(range(3), desc='batch'):
+                    pass
+        frames = metrics.snapshot()['counters']['frames_rendered']
+    finally:
+        metrics.disable()
+    capsys.readouterr()
+    # 2000 finished inner bars must not force 2000 redraws
+    assert frames < 20
+
+
+def test_eta_clamped(capsys):
+    p = Progress()
+    bar = p.add(total=10)
+    bar.update(20)
+    assert bar.eta == 0
+    assert '<00:00,' in bar.render()
+    p.close()
+    capsys.readouterr()
+
+
+def test_break(capsys):
+    for i in track(range(100), desc='x'):
+        if i == 9:
+            break
+    out = capsys.readouterr().out
+    assert '9/100' in out
+
+
+def test_bool(capsys):
+    p = Progress()
+    assert p.add()
+    assert track(iter([]))
+    p.close()
+    capsys.readouterr()
+
+
+def test_format_time():
+    assert _format_time(None) == '--:--'
+    assert _format_time(61) == '01:01'
+    assert _format_time(3661) == '1:01:01'
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import pytest
+sys.path.append('.')
+from xprint import metrics
+import io
+from xprint.colors import colorize, cprint, len_cstring, register_color, set_theme, Theme
+from xprint.tablize import tablize
+from xprint.text import Text, Style, NULL_STYLE, BIT4, NO_COLOR
+
+
+@pytest.fixture(autouse=True)
+def term(monkeypatch):
+    monkeypatch.setenv('TERM', 'xterm-256color')
+
+RED = Style(fg='red', sgr='bold')
+
+
+def test_style_interned():
+    assert Style(fg=[1, 2, 3]) is Style(fg=(1, 2, 3))
+    assert Style() is NULL_STYLE
+    assert RED.overlay(Style(bg='blue')) is Style('red', 'blue', 'bold')
+
+
+def test_render_matches_colorize():
+    t = Text('error', RED) + ': ' + Text('boom', Style(fg=(1, 2, 3)))
+    assert t.render() == colorize('error', fg='red', sgr='bold') + ': ' \
+        + colorize('boom', fg=(1, 2, 3))
+    assert str(t) == t.render()
+    assert t.render(depth=NO_COLOR) == 'error: boom'
+    assert t.render(depth=BIT4).startswith('\033[1;31merror\033[0m')
+
+
+def test_concat_and_width():
+    t = Text('ab', RED) + Text('cd', Style(fg='red', sgr='bold')) + 'ef'
+    assert len(t.segments) == 2
+    assert len(t) == 6
+    assert len_cstring(t) == 6
+    assert ('x' + t).plain == 'xabcdef'
+
+
+def test_slice():
+    t = Text('abc', RED) + 'def' + Text('ghi', Style(fg='blue'))
+    assert t[2:7].plain == 'cdefg'
+    assert [s.style for s in t[2:7].segments] == [RED, NULL_STYLE, Style(fg='blue')]
+    assert t[-1].plain == 'i'
+    assert t.truncate(5, '~').plain == 'abcd~'
+
+
+def test_overlay():
+    t = Text('abcdef', RED).overlay(Style(bg='blue'), 2, 4)
+    assert [s.text for s in t.segments] == ['ab', 'cd', 'ef']
+    assert t.segments[1].style is Style('red', 'blue', 'bold')
+    # color names are resolved with the theme of the colorize call
+    assert colorize(Text('ab'), fg='green').segments[0].style == Style(fg=(0, 255, 0))
+    assert str(colorize(Text('ab'), style='error')) == colorize('ab', style='error')
+
+
+def test_theme_render():
+    theme = Theme('text', colors={'red': (200, 0, 0)})
+    assert Text('a', Style(fg='red')).render(theme=theme) == colorize('a', fg=(200, 0, 0))
+
+
+def test_tablize():
+    table = tablize([Text('abcdef', RED), 'x'], cols=2, col_ws=[3, 2], sep='|')
+    assert table == colorize('abc', fg='red', sgr='bold') + '|x \n'
+
+
+def test_intern_table_overflow():
+    red = Style(fg='red')
+    for i in range(1100):
+        Style(fg=(i % 256, i // 256, 0))
+    red2 = Style(fg='red')
+    assert red == red2
+    assert Text('a', red) + Text('b', red2) == Text('ab', red2)
+    assert len(Text.from_segments([('a', red), ('b', red2)]).segments) == 1
+    assert not Text('a').segments[0].style
+
+
+def test_alias_bit4():
+    theme = Theme('text_alias', colors={'primary': 'red'})
+    t = Text('a', Style(fg='primary'))
+    assert t.render(depth=BIT4, theme=theme) == '\033[31ma\033[0m'
+    assert t.render(theme=theme) == colorize('a', fg=(255, 0, 0))
+    register_color('text_tmp', (250, 10, 10))
+    assert Text('a', Style(fg='text_tmp')).render(depth=BIT4) == '\033[31ma\033[0m'
+
+
+def test_colorize_text_checks(monkeypatch):
+    monkeypatch.setenv('TERM', 'dumb')
+    with pytest.raises(OSError):
+        colorize(Text('a'), fg='red')
+    assert colorize(Text('a'), fg=(1, 2, 3)).plain == 'a'
+    with pytest.raises(TypeError):
+        colorize(Text('a'), use_parser=True)
+
+
+def test_metrics():
+    metrics.enable()
+    metrics.reset()
+    t = colorize(Text('ab'), fg=(1, 2, 3))
+    s = t.render()
+    t.render()
+    c = metrics.snapshot()['counters']
+    assert c['colorize_calls'] == 1
+    assert c['text_renders'] == 2 and c['text_render_hits'] == 1
+    assert c['colorize_bytes'] == 2 * len(s)
+    assert c['colorize_escape_bytes'] == 2 * (len(s) - 2)
+    metrics.disable()
+
+
+def test_colorize_text_theme():
+    t = Theme('mine', colors={'brand': (9, 9, 9)}, styles={'hi': dict(fg='brand')})
+    expect = colorize('a', style='hi', theme=t)
+    assert expect == '\033[38;2;9;9;9ma\033[0m'
+    assert str(colorize(Text('a'), style='hi', theme=t)) == expect
+    assert str(colorize(Text('a'), fg='brand', theme=t)) == expect
+
+
+def test_cprint_text_sink_theme():
+    t = Theme('sink_text', colors={'primary': (7, 7, 7)})
+    out = io.StringIO()
+    set_theme(t, sink=out)
+    try:
+        cprint(Text('x'), fg='primary', file=out)
+        cprint(Text('y', Style(fg='primary')), file=out)
+    finally:
+        set_theme(None, sink=out)
+    assert out.getvalue() == colorize('x', fg=(7, 7, 7)) + '\n' + colorize('y', fg=(7, 7, 7)) + '\n'
+
+
+def test_truncate_negative():
+    assert Text('abcdef').truncate(-1).plain == ''
+    assert Text('abcdef').truncate(0).plain == ''
+    assert Text('abcdef').truncate(-1, '~').plain == ''
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import io
+import sys
+import threading
+import pytest
+sys.path.append('.')
+from xprint.colors import (
+    colorize, cprint, register_color, Theme, register_theme, set_theme,
+    get_theme, use_theme, DEFAULT_THEME)
+
+
+@pytest.fixture(autouse=True)
+def term(monkeypatch):
+    monkeypatch.setenv('TERM', 'xterm-256color')
+
+
+def test_style():
+    assert colorize('x', style='error') == colorize('x', fg='red', sgr='bold')
+    assert colorize('x', option='style:ok') == colorize('x', fg='green')
+    # undefined style falls back to fg / bg / sgr
+    assert colorize('x', fg='blue', style='nope') == colorize('x', fg='blue')
+
+
+def test_abbrev():
+    assert colorize('x', fg='r') == colorize('x', fg='red')
+
+
+def test_register_color_invalidates():
+    register_color('tmp_color', (1, 2, 3))
+    a = colorize('x', fg='tmp_color')
+    register_color('tmp_color', (4, 5, 6))
+    b = colorize('x', fg='tmp_color')
+    assert a != b
+    assert b == colorize('x', fg=(4, 5, 6))
+
+
+def test_theme_overlay():
+    theme = Theme('test', colors={'red': (200, 0, 0)},
+                  styles={'error': dict(fg='red')})
+    assert colorize('x', fg='red', theme=theme) == colorize('x', fg=(200, 0, 0))
+    assert colorize('x', style='error', theme=theme) == colorize('x', fg=(200, 0, 0))
+    theme.register_style('error', fg='blue')
+    assert colorize('x', style='error', theme=theme) == colorize('x', fg=(0, 0, 255))
+
+
+def test_use_theme():
+    theme = Theme('ctx', colors={'green': (0, 100, 0)})
+    register_theme(theme)
+    with use_theme('ctx'):
+        assert get_theme() is theme
+        assert colorize('x', fg='green') == colorize('x', fg=(0, 100, 0))
+        seen = []
+        t = threading.Thread(target=lambda: seen.append(get_theme()))
+        t.start()
+        t.join()
+        assert seen == [DEFAULT_THEME]
+    assert get_theme() is DEFAULT_THEME
+
+
+def test_sink_theme():
+    theme = Theme('sink', styles={'ok': dict(fg=(1, 1, 1))})
+    out = io.StringIO()
+    set_theme(theme, sink=out)
+    try:
+        cprint('x', style='ok', file=out)
+        assert out.getvalue() == colorize('x', fg=(1, 1, 1)) + '\n'
+        assert get_theme() is DEFAULT_THEME
+    finally:
+        set_theme(None, sink=out)
+    assert get_theme(out) is DEFAULT_THEME
+
+
+def test_alias():
+    theme = Theme('alias', colors={'primary': 'red', 'accent': 'primary', 'loop': 'loop'},
+                  styles={'err': dict(fg='accent')})
+    red = colorize('x', fg=(255, 0, 0))
+    assert colorize('x', fg='primary', theme=theme) == red
+    assert colorize('x', fg='accent', theme=theme) == red
+    assert colorize('x', style='err', theme=theme) == red
+    assert colorize('x', fg='loop', theme=theme) == colorize('x')
+    register_color('tmp_alias', 'blue')
+    assert colorize('x', fg='tmp_alias') == colorize('x', fg=(0, 0, 255))
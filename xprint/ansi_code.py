@@ -7,6 +7,7 @@ ANSICODE = namedtuple("ANSICODE", ['name', 'abbrev', 'code'])
 
 ESC = '\033'
 RESET = ESC + '[0m'
+ERASE_LINE = ESC + '[K'
 DEFAULT = ANSICODE('DEFAULT', ['default'], '')
 
 
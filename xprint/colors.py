@@ -8,8 +8,12 @@ Ref: https://en.wikipedia.org/wiki/ANSI_escape_code
 
 import os
 import re
+import threading
+import contextvars
+from contextlib import contextmanager
 from typing import Union
 from .ansi_code import SGR, ESC, RESET, COLORS
+from . import metrics
 
 # ---------------------------------------------
 # Define variables
@@ -32,6 +36,14 @@ COLOR_MAP = {
     'white': (255, 255, 255),
 }
 
+# bumped on every palette registration, themes recompile when it changes
+COLOR_VERSION = 0
+
+# max number of resolved (fg, bg, sgr) -> escape code entries kept per theme
+_STYLE_CACHE_SIZE = 1024
+
+_REGISTRY_LOCK = threading.Lock()
+
 # ---------------------------------------------
 # color functions
 # ---------------------------------------------
@@ -57,14 +69,50 @@ def is_256color_terminal():
 def register_color(name, color):
     """
     register color
+
+    `COLOR_MAP` is replaced by an updated copy instead of being mutated, and
+    `COLOR_VERSION` is bumped so themes drop their cached codes on next use.
     """
-    COLOR_MAP[name] = color
+    global COLOR_MAP, COLOR_VERSION
+    with _REGISTRY_LOCK:
+        cmap = dict(COLOR_MAP)
+        cmap[name] = color
+        COLOR_MAP = cmap
+        COLOR_VERSION += 1
+
+
+def _palette_color(palette, name):
+    seen = set()
+    while True:
+        seen.add(name)
+        if name in palette:
+            color = palette[name]
+        elif name.lower() in palette:
+            color = palette[name.lower()]
+        else:
+            # abbreviations, eg. 'r' -> 'red'
+            color = palette.get(COLORS.get(name.lower()).name.lower(), 'default')
+        # follow aliases, eg. 'primary' -> 'red' -> (255, 0, 0)
+        if _parse_color_type(color) != BIT4_COLOR:
+            return color
+        if color in seen:
+            return 'default'
+        name = color
+
+
+def _resolve_color(palette, color):
+    if _parse_color_type(color) == BIT4_COLOR:
+        return _palette_color(palette, color)
+    return color
 
 
 def len_cstring(string):
     """
     get length of a colored string
     """
+    if not isinstance(string, str):
+        # Text knows its visible width
+        return len(string)
     pat = re.compile('\\033\[([0-9|;]*)m(.*)\\033\[0m')
     info = pat.findall(string)
     if len(info) == 0:
@@ -136,7 +184,7 @@ def _parse_option(kwargs, option):
     return kwargs
 
 
-def _parse_complex_mode(string):
+def _parse_complex_mode(string, theme=None):
     pat = re.compile('\$\[([a-z|\||:|\(|0-9|,|\)]*)\]\((.*?)\)')
     # pat = re.compile('\$\[([a-z|\||:|\(|\)]*)\]\((.*?)\)')
     segm = pat.split(string)
@@ -149,7 +197,7 @@ def _parse_complex_mode(string):
             continue
         else:
             if option != '':
-                ret += colorize(s, option=option)
+                ret += colorize(s, option=option, theme=theme)
                 option = ''
             else:
                 ret += s
@@ -201,6 +249,29 @@ def bit4_colorize(
     return f'{ESC}[{code}m{string}{RESET}'
 
 
+def _rgb_code(fg, bg, sgr):
+    fg_code = _parse_color(fg)
+    bg_code = _parse_color(bg)
+    if fg_code:
+        fg_code = '38;2;' + fg_code
+    if bg_code:
+        bg_code = '48;2;' + bg_code
+
+    sgr_code = SGR.get_code(sgr.lower())
+    if sgr_code:
+        sgr_code += ';'
+
+    code = f'{sgr_code}{fg_code}{bg_code}'
+    if len(code) > 0 and code[-1] == ';':
+        code = code[:-1]
+
+    return f'{ESC}[{code}m'
+
+
+def _style_key(color):
+    return tuple(color) if isinstance(color, list) else color
+
+
 def rgb_colorize(
         string: str,
         fg: Union[tuple, list, str] = (),
@@ -224,22 +295,202 @@ def rgb_colorize(
         str: The input string with the specified foreground color, background color, and style applied.
     """
 
-    fg_code = _parse_color(fg)
-    bg_code = _parse_color(bg)
-    if fg_code:
-        fg_code = '38;2;' + fg_code
-    if bg_code:
-        bg_code = '48;2;' + bg_code
+    return f'{_rgb_code(fg, bg, sgr)}{string}{RESET}'
 
-    sgr_code = SGR.get_code(sgr.lower())
-    if sgr_code:
-        sgr_code += ';'
 
-    code = f'{sgr_code}{fg_code}{bg_code}'
-    if len(code) > 0 and code[-1] == ';':
-        code = code[:-1]
+# ---------------------------------------------
+# themes
+# ---------------------------------------------
 
-    return f'{ESC}[{code}m{string}{RESET}'
+class Theme:
+    """
+    A named palette plus semantic styles.
+
+    Colors registered on a theme overlay the global `COLOR_MAP`. Styles map a
+    semantic name (eg. "error") to fg / bg / sgr and are compiled to escape
+    codes up front. Registration is copy-on-write: the compiled state is
+    rebuilt and swapped in as a whole, so readers never see half an update.
+
+    Param:
+        name: theme name
+        colors: dict of color name -> color, same formats as `colorize` fg
+        styles: dict of style name -> dict(fg=..., bg=..., sgr=...)
+
+    Usage:
+        >>> theme = Theme('dark', colors={'olive': '#808000'},
+        >>>               styles={'error': dict(fg='red', sgr='bold')})
+        >>> colorize('boom', style='error', theme=theme)
+        >>> with use_theme(theme):
+        >>>     cprint('$[style:error](boom)', use_parser=True)
+    """
+    def __init__(self, name: str, colors: dict = None, styles: dict = None):
+        self.name = name
+        self._lock = threading.Lock()
+        self._colors = dict(colors or {})
+        self._styles = {k: dict(v) for k, v in (styles or {}).items()}
+        self._compile()
+
+    def _compile(self):
+        version = COLOR_VERSION
+        palette = dict(COLOR_MAP)
+        palette.update(self._colors)
+
+        codes = {}
+        for name, st in self._styles.items():
+            codes[name] = _rgb_code(
+                _resolve_color(palette, st.get('fg', 'default')),
+                _resolve_color(palette, st.get('bg', 'default')),
+                st.get('sgr', ''))
+        # (version, palette, style codes, resolved style cache)
+        self._state = (version, palette, codes, {})
+
+    def state(self):
+        st = self._state
+        if st[0] != COLOR_VERSION:
+            with self._lock:
+                if self._state[0] != COLOR_VERSION:
+                    self._compile()
+                st = self._state
+        return st
+
+    def register_color(self, name, color):
+        with self._lock:
+            colors = dict(self._colors)
+            colors[name] = color
+            self._colors = colors
+            self._compile()
+
+    def register_style(self, name, fg='default', bg='default', sgr=''):
+        with self._lock:
+            styles = dict(self._styles)
+            styles[name] = dict(fg=fg, bg=bg, sgr=sgr)
+            self._styles = styles
+            self._compile()
+
+    @property
+    def styles(self):
+        return list(self._styles)
+
+    def get_style(self, name):
+        """
+        get the fg / bg / sgr of a style as a dict, None if not defined
+        """
+        st = self._styles.get(name)
+        return dict(st) if st is not None else None
+
+    def code(self, style):
+        """
+        get the precompiled escape code of a style, '' if not defined
+        """
+        return self.state()[2].get(style, '')
+
+    def __repr__(self):
+        return f'Theme({self.name!r})'
+
+
+DEFAULT_THEME = Theme('default', styles={
+    'error': dict(fg='red', sgr='bold'),
+    'warning': dict(fg='yellow'),
+    'ok': dict(fg='green'),
+    'info': dict(fg='cyan'),
+    'debug': dict(sgr='faint'),
+})
+
+THEMES = {'default': DEFAULT_THEME}
+
+_global_theme = DEFAULT_THEME
+_context_theme = contextvars.ContextVar('xprint_theme', default=None)
+_sink_themes = {}
+
+
+def register_theme(theme: Theme):
+    """
+    register theme by its name so it could be selected by name
+    """
+    global THEMES
+    with _REGISTRY_LOCK:
+        themes = dict(THEMES)
+        themes[theme.name] = theme
+        THEMES = themes
+
+
+def _as_theme(theme):
+    if isinstance(theme, str):
+        return THEMES[theme]
+    return theme
+
+
+def set_theme(theme: Union[Theme, str], sink=None):
+    """
+    Set the theme used by default, or the theme bound to an output sink.
+
+    Args:
+        theme: Theme or name of a registered theme. None unbinds a sink.
+        sink: file-like object eg. sys.stderr. If None, set the global theme.
+    """
+    global _global_theme, _sink_themes
+    with _REGISTRY_LOCK:
+        if sink is None:
+            _global_theme = _as_theme(theme) or DEFAULT_THEME
+        else:
+            sinks = dict(_sink_themes)
+            if theme is None:
+                sinks.pop(sink, None)
+            else:
+                sinks[sink] = _as_theme(theme)
+            _sink_themes = sinks
+
+
+def get_theme(sink=None):
+    """
+    Get the active theme. A theme bound to `sink` wins over the one set by
+    `use_theme`, which wins over the global theme.
+    """
+    if sink is not None and _sink_themes:
+        theme = _sink_themes.get(sink)
+        if theme is not None:
+            return theme
+    theme = _context_theme.get()
+    if theme is not None:
+        return theme
+    return _global_theme
+
+
+@contextmanager
+def use_theme(theme: Union[Theme, str]):
+    """
+    Switch theme within a context, local to the current thread / task.
+
+    Usage:
+        >>> with use_theme('mono'):
+        >>>     cprint('done', style='ok')
+    """
+    token = _context_theme.set(_as_theme(theme))
+    try:
+        yield _context_theme.get()
+    finally:
+        _context_theme.reset(token)
+
+
+def _colorize_text(text, fg, bg, sgr, option, style, theme):
+    from .text import Style
+    kwargs = {'fg': fg, 'bg': bg, 'sgr': sgr, 'style': style}
+    if option:
+        kwargs = _parse_option(kwargs, option)
+    spec = theme.get_style(kwargs['style']) if kwargs['style'] else None
+    if spec is None:
+        spec = {'fg': kwargs['fg'], 'bg': kwargs['bg'], 'sgr': kwargs['sgr']}
+        # same check as for str, styles of the theme are exempt like on the str path
+        for c in (spec['fg'], spec['bg']):
+            if _parse_color_type(c) == BIT4_COLOR and not is_256color_terminal():
+                raise OSError("Terminal does not support 256 colors, please use bit4_colorize instead.")
+    # resolve names now, Text.render may run under another theme
+    palette = theme.state()[1]
+    spec['fg'] = _resolve_color(palette, spec.get('fg', 'default'))
+    spec['bg'] = _resolve_color(palette, spec.get('bg', 'default'))
+    if metrics.RECORDER is not None:
+        metrics.RECORDER.incr('colorize_calls')
+    return text.overlay(Style(**spec))
 
 
 def colorize(
@@ -249,6 +500,8 @@ def colorize(
         sgr: str = '',
         option: str = None,
         use_parser: bool = False,
+        style: str = None,
+        theme: Union[Theme, str] = None,
         **kwargs):
     """
     Colorize a string using RGB colors or 8-bit color.
@@ -268,10 +521,14 @@ def colorize(
             `option = f"fg:{fg}|bg:{bg}|sgr:{sgr}"`. This allows for more complex colorization options. Defaults to None.
         use_parser (bool, optional): 
             If True, the function will parse the input string for colorize options enclosed in `$[]()`. Defaults to False.
+        style (str, optional):
+            A semantic style of the theme, eg. "error" or "ok". Overrides fg / bg / sgr if the theme defines it. Defaults to None.
+        theme (Union[Theme, str], optional):
+            The theme used to resolve color names and styles. Defaults to the active theme, see `get_theme`.
         **kwargs: Additional keyword arguments that can be used to customize the colorization.
 
     Returns:
-        str: The colored string.
+        str: The colored string. If `string` is a `Text`, a `Text` with the style overlaid.
 
     Raises:
         OSError: If the terminal does not support 256 colors and 8-bit color is used.
@@ -290,8 +547,19 @@ def colorize(
         print(colored_string)  # Prints the string in green foreground and italic style
     """
 
+    theme = get_theme() if theme is None else _as_theme(theme)
+
+    if not isinstance(string, str):
+        from .text import Text
+        if isinstance(string, Text):
+            if use_parser:
+                raise TypeError('use_parser is not supported for Text, build it from segments instead.')
+            return _colorize_text(string, fg, bg, sgr, option, style, theme)
+
     if use_parser:
-        return _parse_complex_mode(string)
+        return _parse_complex_mode(string, theme)
+
+    _, palette, codes, cache = theme.state()
 
     def get_color(c):
         ctype = _parse_color_type(c)
@@ -301,7 +569,7 @@ def colorize(
             if not is_256color_terminal():
                 raise OSError("Terminal does not support 256 colors, please use bit4_colorize instead.")
             else:
-                return COLOR_MAP.get(c, 'default'), ctype
+                return _palette_color(palette, c), ctype
         return c, ctype
 
     kwargs.update({
@@ -310,14 +578,32 @@ def colorize(
         'bg': bg,
         'sgr': sgr,
         'option': None,
+        'style': style,
     })
     if option:
         kwargs = _parse_option(kwargs, option)
 
-    kwargs['fg'], fg_ctype = get_color(kwargs['fg'])
-    kwargs['bg'], bg_ctype = get_color(kwargs['bg'])
-
-    return rgb_colorize(**kwargs)
+    code = codes.get(kwargs['style']) if kwargs['style'] else None
+    hit = code is not None
+    if not hit:
+        fg, fg_ctype = get_color(kwargs['fg'])
+        bg, bg_ctype = get_color(kwargs['bg'])
+        sgr = kwargs['sgr']
+
+        key = (_style_key(fg), _style_key(bg), sgr)
+        code = cache.get(key)
+        hit = code is not None
+        if not hit:
+            code = _rgb_code(fg, bg, sgr)
+            if len(cache) >= _STYLE_CACHE_SIZE:
+                cache.clear()
+            cache[key] = code
+
+    string = kwargs['string']
+    ret = f'{code}{string}{RESET}'
+    if metrics.RECORDER is not None:
+        metrics.RECORDER.record_colorize(string, ret, hit)
+    return ret
 
 
 def cprint(
@@ -327,8 +613,18 @@ def cprint(
         sgr: str = '',
         option: str = None,
         use_parser: bool = False,
+        file=None,
         **kwargs):
     """
     colorize print function. Parmas same as `colorize`.
+    `file` is passed to `print`, the theme bound to it by `set_theme` is used.
     """
-    print(colorize(string, fg, bg, sgr, option, use_parser, **kwargs))
+    if kwargs.get('theme') is None:
+        kwargs['theme'] = get_theme(file)
+    ret = colorize(string, fg, bg, sgr, option, use_parser, **kwargs)
+    if not isinstance(ret, str):
+        # Text, str() would render it with the global theme instead
+        ret = ret.render(theme=kwargs['theme'])
+    print(ret, file=file)
+    if metrics.RECORDER is not None:
+        metrics.RECORDER.record_write(f'{ret}\n')
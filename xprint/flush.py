@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import sys
+import time
 from .ansi_code import *
+from . import metrics
 
 
 def flush(lines: int = 1):
@@ -22,7 +24,10 @@ def flush(lines: int = 1):
     elif lines == 1:
         sys.stdout.flush()
     else:
-        sys.stdout.write(ESC + '[{}A\r'.format(lines - 1))
+        code = ESC + '[{}A\r'.format(lines - 1)
+        sys.stdout.write(code)
+        if metrics.RECORDER is not None:
+            metrics.RECORDER.record_write(code)
 
 
 class Flushing:
@@ -42,15 +47,19 @@ class Flushing:
     def __init__(self, lines):
         self.lines = lines
         self.cnt = 0
+        self._t0 = None
 
     def print(self, string):
         if self.cnt < self.lines-1:
-            print(string)
+            end = '\n'
         elif self.cnt == self.lines-1:
-            print(string, end='')
+            end = ''
         else:
             raise IndexError(
                 f'string (line index: {self.cnt}) to be printed is out of range of Flushing ({self.lines}).')
+        print(string, end=end)
+        if metrics.RECORDER is not None:
+            metrics.RECORDER.record_write(f'{string}{end}')
         self.cnt += 1
 
     def flush(self):
@@ -58,10 +67,15 @@ class Flushing:
 
     def __enter__(self):
         self.cnt = 0
+        self._t0 = time.perf_counter() if metrics.RECORDER is not None else None
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.flush()
+        if metrics.RECORDER is not None and self._t0 is not None:
+            metrics.RECORDER.record_frame(
+                (time.perf_counter() - self._t0) * 1000,
+                dropped=exc_type is not None)
 
 
 def flush_print(s: str):
@@ -73,8 +87,11 @@ def flush_print(s: str):
         >>>     flush_print(f'{i}\r{i+1}\r{i+2}')
         >>>     time.sleep(0.5)
     """
+    s = str(s)
     lines = s.split('\r')
     for line in lines[:-1]:
         print(line)
     print(lines[-1], end='')
+    if metrics.RECORDER is not None:
+        metrics.RECORDER.record_write(s.replace('\r', '\n'))
     flush(len(lines))
\ No newline at end of file
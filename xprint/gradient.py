@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Gradient and per-character color effects.
+
+Colors of all character positions are interpolated at once (with NumPy when
+it is installed) and quantized, then adjacent positions sharing a color are
+merged into runs so each run costs a single escape code. Runs are cached per
+(width, stops, ...), so re-rendering a frame of the same width is only a join.
+
+Usage:
+    >>> from xprint.gradient import gradient, gradient_lines, rainbow
+    >>> print(gradient('xprint is great', ['red', '#0000ff']))
+    >>> print('\\n'.join(gradient_lines(banner.split('\\n'), [(255, 0, 0), (0, 0, 255)], vertical=True)))
+    >>> print(rainbow('xprint'))
+"""
+
+from typing import List, Union
+from .ansi_code import RESET
+from .colors import (
+    _parse_color_type, _palette_color, _rgb_code, get_theme,
+    BIT4_COLOR, RGB_COLOR, _STYLE_CACHE_SIZE)
+from . import metrics
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ---------------------------------------------
+# Define variables
+# ---------------------------------------------
+
+RAINBOW = (
+    (255, 0, 0),
+    (255, 127, 0),
+    (255, 255, 0),
+    (0, 255, 0),
+    (0, 0, 255),
+    (75, 0, 130),
+    (148, 0, 211),
+)
+
+# (width, stops, quantize, bg, sgr) -> [(start, end, code), ...]
+_RUN_CACHE = {}
+
+
+# ---------------------------------------------
+# helpers
+# ---------------------------------------------
+
+def _to_rgb(stop):
+    color = stop
+    ctype = _parse_color_type(color)
+    if ctype == BIT4_COLOR:
+        color = _palette_color(get_theme().state()[1], color)
+        ctype = _parse_color_type(color)
+    if ctype != RGB_COLOR:
+        raise ValueError(f'invalid gradient stop: {stop!r}')
+    if isinstance(color, str):
+        hexcode = color.lstrip('#')
+        hlen = len(hexcode)
+        color = [int(hexcode[i:i + hlen // 3], 16) for i in range(0, hlen, hlen // 3)]
+    return tuple(int(c) for c in color)
+
+
+def _interpolate(width, stops, quantize):
+    """
+    get quantized colors of `width` evenly spaced positions, as a list of rgb tuples
+    """
+    nstops = len(stops)
+    if np is not None:
+        pos = np.linspace(0., 1., width) if width > 1 else np.zeros(1)
+        xp = np.linspace(0., 1., nstops)
+        fp = np.asarray(stops, dtype=np.float64)
+        rgb = np.stack([np.interp(pos, xp, fp[:, i]) for i in range(3)], axis=1)
+        rgb = np.clip(np.rint(rgb / quantize) * quantize, 0, 255).astype(np.int64)
+        return [tuple(c) for c in rgb.tolist()]
+
+    colors = []
+    for i in range(width):
+        t = (i / (width - 1) if width > 1 else 0.) * (nstops - 1)
+        k = min(int(t), nstops - 2)
+        f = t - k
+        c0, c1 = stops[k], stops[k + 1]
+        colors.append(tuple(
+            min(255, max(0, int(round((a + (b - a) * f) / quantize)) * quantize))
+            for a, b in zip(c0, c1)))
+    return colors
+
+
+def _runs(width, stops, quantize, bg, sgr):
+    key = (width, stops, quantize, bg, sgr)
+    runs = _RUN_CACHE.get(key)
+    if runs is not None:
+        return runs, True
+
+    if len(stops) == 1:
+        colors = [stops[0]] * width
+    else:
+        colors = _interpolate(width, stops, quantize)
+
+    runs = []
+    start = 0
+    for i in range(1, width + 1):
+        if i == width or colors[i] != colors[start]:
+            if bg:
+                code = _rgb_code('default', colors[start], sgr)
+            else:
+                code = _rgb_code(colors[start], 'default', sgr)
+            runs.append((start, i, code))
+            start = i
+    runs = tuple(runs)
+
+    if len(_RUN_CACHE) >= _STYLE_CACHE_SIZE:
+        _RUN_CACHE.clear()
+    _RUN_CACHE[key] = runs
+    return runs, False
+
+
+def _render(text, runs):
+    n = len(text)
+    parts = []
+    end = 0
+    for start, end, code in runs:
+        if start >= n:
+            break
+        parts.append(code)
+        parts.append(text[start:end])
+    if end < n:
+        # text longer than the gradient keeps the last color
+        parts.append(text[end:])
+    parts.append(RESET)
+    return ''.join(parts)
+
+
+def _prepare(stops, quantize):
+    if len(stops) == 0:
+        raise ValueError('gradient needs at least one stop.')
+    if quantize < 1:
+        raise ValueError('quantize should be a positive integer.')
+    return tuple(_to_rgb(c) for c in stops), int(quantize)
+
+
+# ---------------------------------------------
+# gradient functions
+# ---------------------------------------------
+
+def gradient(
+        text: str,
+        stops: List[Union[tuple, list, str]],
+        quantize: int = 1,
+        bg: bool = False,
+        sgr: str = '',
+        width: int = None):
+    """
+    Colorize a string with a horizontal gradient.
+
+    Args:
+        text (str): The input string.
+        stops (list): Colors evenly spaced from the first to the last character.
+            Each stop could be an RGB tuple / list, HEX RGB color or a color name.
+        quantize (int, optional):
+            Round each channel to a multiple of `quantize`. Larger values merge more
+            adjacent characters into one escape code. Defaults to 1.
+        bg (bool, optional): Apply the gradient to the background instead. Defaults to False.
+        sgr (str, optional): Style applied to every character. Defaults to ''.
+        width (int, optional):
+            Width the gradient spans, defaults to `len(text)`. Use a fixed width to keep
+            colors stable across frames of different text lengths.
+
+    Returns:
+        str: The colored string.
+    """
+    stops, quantize = _prepare(stops, quantize)
+    width = len(text) if width is None else width
+    if width <= 0 or len(text) == 0:
+        return text
+    runs, hit = _runs(width, stops, quantize, bg, sgr)
+    ret = _render(text, runs)
+    if metrics.RECORDER is not None:
+        metrics.RECORDER.record_gradient(text, ret, hit)
+    return ret
+
+
+def gradient_lines(
+        lines: List[str],
+        stops: List[Union[tuple, list, str]],
+        vertical: bool = False,
+        quantize: int = 1,
+        bg: bool = False,
+        sgr: str = ''):
+    """
+    Colorize lines with a gradient. Params same as `gradient`.
+
+    Args:
+        vertical (bool, optional):
+            If True, colors go from the first to the last line and each line gets a
+            single color. Otherwise each line gets the same horizontal gradient,
+            spanning the width of the longest line so columns keep their colors.
+
+    Returns:
+        List[str]: The colored lines.
+    """
+    stops, quantize = _prepare(stops, quantize)
+    if len(lines) == 0:
+        return []
+    if vertical:
+        runs, hit = _runs(len(lines), stops, quantize, bg, sgr)
+        codes = [code for start, end, code in runs for _ in range(end - start)]
+        ret = [f'{code}{line}{RESET}' if line else line for code, line in zip(codes, lines)]
+    else:
+        width = max(len(line) for line in lines)
+        if width == 0:
+            return list(lines)
+        runs, hit = _runs(width, stops, quantize, bg, sgr)
+        ret = [_render(line, runs) if line else line for line in lines]
+    if metrics.RECORDER is not None:
+        for line, rline in zip(lines, ret):
+            metrics.RECORDER.record_gradient(line, rline, hit)
+    return ret
+
+
+def rainbow(text: str, quantize: int = 1, bg: bool = False, sgr: str = ''):
+    """
+    Colorize a string with rainbow colors.
+    """
+    return gradient(text, RAINBOW, quantize=quantize, bg=bg, sgr=sgr)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Opt-in runtime metrics for rendering cost.
+
+Nothing is recorded until `enable()` is called. While disabled, `RECORDER`
+is None and the instrumented code paths only test for that before moving on.
+
+Usage:
+    >>> from xprint import metrics
+    >>> metrics.enable()
+    >>> ...  # colorize / Flushing / tablize as usual
+    >>> metrics.snapshot()
+    >>> metrics.start_dump(interval=10)  # optional periodic dump to stderr
+"""
+
+import re
+import sys
+import json
+import threading
+
+# ---------------------------------------------
+# Define variables
+# ---------------------------------------------
+
+# colorize_bytes / colorize_escape_bytes: size of the strings colorize,
+#     Text.render and the gradient functions produce
+# gradient_calls / gradient_cache_hits / gradient_cache_misses: gradient
+#     lines colorized and lookups of the gradient run cache, kept apart from
+#     the colorize style cache counters
+# text_renders: Text.render calls, text_render_hits: those served from the
+#     rendered string memoized on the Text
+# bytes_written / escape_bytes_written: what cprint, tprint, flush, Flushing
+#     and flush_print actually write to the terminal
+# frames_dropped: Flushing blocks left by an exception, their time is not
+#     added to the frame render time histogram
+COUNTERS = (
+    'colorize_calls',
+    'style_cache_hits',
+    'style_cache_misses',
+    'colorize_bytes',
+    'colorize_escape_bytes',
+    'text_renders',
+    'text_render_hits',
+    'gradient_calls',
+    'gradient_cache_hits',
+    'gradient_cache_misses',
+    'bytes_written',
+    'escape_bytes_written',
+    'frames_rendered',
+    'frames_dropped',
+    'tablize_cells',
+)
+
+_ESCAPE_PAT = re.compile('\033\\[[0-9;]*[A-Za-z]')
+
+# upper bounds (ms) of the frame render time buckets, last bucket is +inf
+FRAME_MS_BOUNDS = (0.1, 0.5, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+# active recorder, None when instrumentation is disabled
+RECORDER = None
+
+_dump_thread = None
+_dump_stop = None
+
+
+# ---------------------------------------------
+# recorder
+# ---------------------------------------------
+
+class Histogram:
+    """
+    Fixed bucket histogram.
+
+    Param:
+        bounds: sorted upper bounds of the buckets. Values larger than the
+            last bound fall into an extra overflow bucket.
+    """
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        idx = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                idx = i
+                break
+        self.counts[idx] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self):
+        buckets = {str(b): c for b, c in zip(self.bounds, self.counts)}
+        buckets['inf'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'buckets': buckets,
+        }
+
+
+class Metrics:
+    """
+    Counters and histograms of a single recording session. Thread safe.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {name: 0 for name in COUNTERS}
+        self.histograms = {'frame_render_ms': Histogram(FRAME_MS_BOUNDS)}
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, value):
+        with self._lock:
+            self.histograms[name].observe(value)
+
+    def record_colorize(self, string, ret, hit):
+        string = str(string)
+        text_bytes = len(string.encode('utf-8'))
+        esc_bytes = len(ret) - len(string)
+        with self._lock:
+            c = self.counters
+            c['colorize_calls'] += 1
+            if hit:
+                c['style_cache_hits'] += 1
+            else:
+                c['style_cache_misses'] += 1
+            c['colorize_bytes'] += text_bytes + esc_bytes
+            c['colorize_escape_bytes'] += esc_bytes
+
+    def record_gradient(self, string, ret, hit):
+        text_bytes = len(string.encode('utf-8'))
+        esc_bytes = len(ret) - len(string)
+        with self._lock:
+            c = self.counters
+            c['gradient_calls'] += 1
+            if hit:
+                c['gradient_cache_hits'] += 1
+            else:
+                c['gradient_cache_misses'] += 1
+            c['colorize_bytes'] += text_bytes + esc_bytes
+            c['colorize_escape_bytes'] += esc_bytes
+
+    def record_render(self, plain, ret, hit):
+        text_bytes = len(plain.encode('utf-8'))
+        esc_bytes = len(ret) - len(plain)
+        with self._lock:
+            c = self.counters
+            c['text_renders'] += 1
+            if hit:
+                c['text_render_hits'] += 1
+            c['colorize_bytes'] += text_bytes + esc_bytes
+            c['colorize_escape_bytes'] += esc_bytes
+
+    def record_write(self, string):
+        string = str(string)
+        esc_bytes = sum(len(m) for m in _ESCAPE_PAT.findall(string))
+        with self._lock:
+            self.counters['bytes_written'] += len(string.encode('utf-8'))
+            self.counters['escape_bytes_written'] += esc_bytes
+
+    def record_frame(self, elapsed_ms, dropped=False):
+        with self._lock:
+            if dropped:
+                self.counters['frames_dropped'] += 1
+            else:
+                self.counters['frames_rendered'] += 1
+                self.histograms['frame_render_ms'].observe(elapsed_ms)
+
+    def reset(self):
+        with self._lock:
+            for name in self.counters:
+                self.counters[name] = 0
+            for hist in self.histograms.values():
+                hist.reset()
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self.counters)
+            histograms = {k: v.snapshot() for k, v in self.histograms.items()}
+        colorized = counters['colorize_bytes']
+        written = counters['bytes_written']
+        lookups = counters['style_cache_hits'] + counters['style_cache_misses']
+        return {
+            'counters': counters,
+            'histograms': histograms,
+            'colorize_escape_ratio': counters['colorize_escape_bytes'] / colorized if colorized else 0.0,
+            'escape_ratio': counters['escape_bytes_written'] / written if written else 0.0,
+            'style_cache_hit_ratio': counters['style_cache_hits'] / lookups if lookups else 0.0,
+        }
+
+
+# ---------------------------------------------
+# module functions
+# ---------------------------------------------
+
+def enable():
+    """
+    Turn instrumentation on and return the active recorder.
+    Calling it while already enabled keeps the current numbers.
+    """
+    global RECORDER
+    if RECORDER is None:
+        RECORDER = Metrics()
+    return RECORDER
+
+
+def disable():
+    """
+    Turn instrumentation off. Stops the periodic dump if it is running.
+    """
+    global RECORDER
+    stop_dump()
+    RECORDER = None
+
+
+def is_enabled():
+    return RECORDER is not None
+
+
+def reset():
+    """
+    Zero all counters and histograms of the active recorder.
+    """
+    if RECORDER is not None:
+        RECORDER.reset()
+
+
+def snapshot():
+    """
+    Get a point-in-time copy of all metrics.
+
+    Returns:
+        dict: counters, histograms and derived ratios, or an empty dict when
+        instrumentation is disabled.
+    """
+    if RECORDER is None:
+        return {}
+    return RECORDER.snapshot()
+
+
+def dump(file=None):
+    """
+    Write the current snapshot as one json line to `file` (default stderr).
+    """
+    file = sys.stderr if file is None else file
+    file.write(json.dumps(snapshot(), sort_keys=True) + '\n')
+    file.flush()
+
+
+def start_dump(interval: float = 10.0, file=None):
+    """
+    Dump a snapshot every `interval` seconds from a daemon thread.
+    Enables instrumentation if it is not enabled yet.
+    """
+    global _dump_thread, _dump_stop
+    if interval <= 0:
+        raise ValueError('interval should be positive.')
+    stop_dump()
+    enable()
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            dump(file)
+
+    _dump_stop = stop
+    _dump_thread = threading.Thread(target=run, name='xprint-metrics-dump', daemon=True)
+    _dump_thread.start()
+    return _dump_thread
+
+
+def stop_dump():
+    """
+    Stop the periodic dump started by `start_dump`.
+    """
+    global _dump_thread, _dump_stop
+    if _dump_stop is not None:
+        _dump_stop.set()
+        if _dump_thread is not threading.current_thread():
+            _dump_thread.join()
+    _dump_thread = None
+    _dump_stop = None
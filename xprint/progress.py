@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Progress bars drawn in a live region by `Flushing`.
+
+Iterating a bar only counts items; the clock is read every `stride` items,
+where `stride` is re-tuned on each check so checks happen roughly every
+`check_interval` seconds, and the region is redrawn at most `refresh_rate`
+times per second.
+
+Usage:
+    >>> from xprint.progress import track, Progress
+    >>> for i in track(range(10 ** 6), desc='work'):
+    >>>     ...
+    >>> with Progress() as p:
+    >>>     for epoch in p.track(range(10), desc='epoch'):
+    >>>         for batch in p.track(range(1000), desc='batch'):
+    >>>             ...
+"""
+
+import math
+import time
+from typing import Iterable
+from .ansi_code import ERASE_LINE
+from .flush import Flushing, flush
+from . import metrics
+
+
+def _format_time(seconds):
+    if seconds is None or math.isinf(seconds) or math.isnan(seconds):
+        return '--:--'
+    seconds = int(seconds)
+    m, s = divmod(seconds, 60)
+    h, m = divmod(m, 60)
+    if h:
+        return f'{h}:{m:02d}:{s:02d}'
+    return f'{m:02d}:{s:02d}'
+
+
+class ProgressBar:
+    """
+    A single progress bar. Create it with `Progress.add` / `Progress.track`,
+    or with `track` for a standalone bar.
+
+    Param:
+        progress: the `Progress` region the bar is drawn in
+        iterable: iterable to wrap, optional if only `update` is used
+        total: number of items, taken from `len(iterable)` if possible
+        desc: description shown before the bar
+        width: width of the bar in characters
+    """
+    fill = '#'
+    empty = '-'
+
+    def __init__(self, progress, iterable=None, total=None, desc='', width=30):
+        if total is None and iterable is not None:
+            try:
+                total = len(iterable)
+            except TypeError:
+                total = None
+        self.progress = progress
+        self.iterable = iterable
+        self.total = total
+        self.desc = desc
+        self.width = width
+        self.n = 0
+        self.closed = False
+
+        self.start_t = time.perf_counter()
+        self._check_t = self.start_t
+        self._check_n = 0
+        self._stride = 1
+        self._next_check = 1
+
+    def __len__(self):
+        return self.total if self.total is not None else 0
+
+    def __bool__(self):
+        # a bar of unknown total has len 0 but is still a bar
+        return True
+
+    def __iter__(self):
+        if self.iterable is None:
+            raise TypeError('ProgressBar is not created with an iterable.')
+        n = self.n
+        next_check = self._next_check
+        try:
+            for obj in self.iterable:
+                yield obj
+                n += 1
+                if n >= next_check:
+                    self.n = n
+                    next_check = self._check()
+        finally:
+            self.n = n
+            self.close()
+
+    def update(self, n: int = 1):
+        """
+        Advance the bar by n items.
+
+        Each call is a Python method call, roughly 100ns. In hot loops iterate
+        through `track` instead, or batch calls, eg. `update(100)` every 100 items.
+        """
+        m = self.n + n
+        self.n = m
+        if m >= self._next_check:
+            self._check()
+
+    def _check(self):
+        now = time.perf_counter()
+        dt = now - self._check_t
+        done = self.n - self._check_n
+        # aim for one clock read per check_interval, grow at most 4x per check
+        target = self.progress.check_interval
+        if dt > 0:
+            stride = int(done * target / dt)
+        else:
+            stride = self._stride * 4
+        self._stride = max(1, min(stride, self._stride * 4))
+        self._check_t = now
+        self._check_n = self.n
+        self._next_check = self.n + self._stride
+        self.progress.refresh(now=now)
+        return self._next_check
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start_t
+
+    @property
+    def rate(self):
+        elapsed = self.elapsed
+        return self.n / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        rate = self.rate
+        if self.total is None or rate <= 0:
+            return None
+        return max(0, self.total - self.n) / rate
+
+    def render(self):
+        """
+        render the bar as a single line
+        """
+        elapsed = self.elapsed
+        rate = self.n / elapsed if elapsed > 0 else 0.0
+        desc = f'{self.desc}: ' if self.desc else ''
+        if self.total:
+            frac = min(1., self.n / self.total)
+            filled = int(frac * self.width)
+            bar = self.fill * filled + self.empty * (self.width - filled)
+            eta = max(0, self.total - self.n) / rate if rate > 0 else None
+            return (f'{desc}|{bar}| {frac * 100:3.0f}% {self.n}/{self.total} '
+                    f'[{_format_time(elapsed)}<{_format_time(eta)}, {rate:.1f}it/s]')
+        return f'{desc}{self.n} [{_format_time(elapsed)}, {rate:.1f}it/s]'
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.progress._close_bar(self)
+
+
+class Progress:
+    """
+    A live region of stacked progress bars, redrawn with `Flushing`.
+
+    Param:
+        refresh_rate: max redraws per second
+        check_interval: seconds between clock reads a bar tunes its stride for,
+            defaults to half the redraw period
+        leave: keep the final state of the bars on screen after close. A bar
+            finished while others are still running is always removed.
+
+    Usage:
+        >>> with Progress(refresh_rate=10) as p:
+        >>>     a = p.add(total=100, desc='download')
+        >>>     for item in p.track(items, desc='parse'):
+        >>>         a.update()
+    """
+    def __init__(self, refresh_rate: float = 10, check_interval: float = None, leave: bool = True):
+        if refresh_rate <= 0:
+            raise ValueError('refresh_rate should be positive.')
+        self.refresh_interval = 1. / refresh_rate
+        self.check_interval = self.refresh_interval / 2 if check_interval is None else check_interval
+        self.leave = leave
+        self.bars = []
+        self.closed = False
+        self._last_draw = -math.inf
+        self._drawn = 0
+
+    def add(self, total: int = None, desc: str = '', iterable: Iterable = None, width: int = 30):
+        """
+        add a bar to the bottom of the region
+        """
+        bar = ProgressBar(self, iterable, total, desc, width)
+        self.closed = False
+        self.bars.append(bar)
+        return bar
+
+    def track(self, iterable: Iterable, total: int = None, desc: str = '', width: int = 30):
+        """
+        add a bar that wraps `iterable`, it is removed from the region when exhausted
+        """
+        return self.add(total, desc, iterable, width)
+
+    def refresh(self, force: bool = False, now: float = None):
+        """
+        redraw the region, unless it is drawn within the last refresh interval
+        """
+        if now is None:
+            now = time.perf_counter()
+        if not force and now - self._last_draw < self.refresh_interval:
+            return
+        self._last_draw = now
+        self._draw()
+
+    def _draw(self):
+        lines = [bar.render() for bar in self.bars]
+        # blank out lines left over from a taller previous frame
+        lines += [''] * (self._drawn - len(lines))
+        if not lines:
+            return
+        with Flushing(len(lines)) as f:
+            for line in lines:
+                f.print('\r' + line + ERASE_LINE)
+        self._drawn = len(lines)
+
+    def _close_bar(self, bar):
+        if bar not in self.bars:
+            return
+        if len(self.bars) == 1:
+            self.close()
+        else:
+            # rate limited like any other redraw, close() draws the final state
+            self.bars.remove(bar)
+            self.refresh()
+
+    def close(self):
+        """
+        draw the final state and move the cursor below the region
+        """
+        if self.closed:
+            return
+        self.closed = True
+        lines = [bar.render() for bar in self.bars] if self.leave else []
+        lines += [''] * (self._drawn - len(lines))
+        # the cursor sits at the start of the region after each draw
+        for line in lines:
+            line = '\r' + line + ERASE_LINE
+            print(line)
+            if metrics.RECORDER is not None:
+                metrics.RECORDER.record_write(line + '\n')
+        if not self.leave and self._drawn:
+            flush(self._drawn + 1)
+        for bar in self.bars:
+            bar.closed = True
+        self.bars = []
+        self._drawn = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def track(iterable: Iterable, total: int = None, desc: str = '', width: int = 30, refresh_rate: float = 10):
+    """
+    Wrap an iterable with a standalone progress bar.
+
+    Usage:
+        >>> for i in track(range(10 ** 6), desc='work'):
+        >>>     ...
+    """
+    return Progress(refresh_rate=refresh_rate).track(iterable, total, desc, width)
@@ -3,6 +3,8 @@
 
 import math
 from .colors import len_cstring
+from .text import Text
+from . import metrics
 
 
 def _tablize(slist, cols, col_ws=[], sep='\t', pad=True, line_prefix=[], line_suffix=[]):
@@ -48,11 +50,17 @@ def _tablize(slist, cols, col_ws=[], sep='\t', pad=True, line_prefix=[], line_su
         else:
             prefix = ''
         ws = col_ws[idx % cols]
-        if ws > 0:
+        if isinstance(slist[idx], Text):
+            # pad and cut by visible width, escape codes are added on render
+            cell = slist[idx].ljust(ws)[:ws] if ws > 0 else slist[idx]
+            rlist[idx] = prefix + cell.render() + suffix
+        elif ws > 0:
             rlist[idx] = prefix + '{{:<{}s}}'.format(ws).format(slist[idx])[:ws] + suffix
         else:
             rlist[idx] = prefix + '{}'.format(slist[idx]) + suffix
  
+    if metrics.RECORDER is not None:
+        metrics.RECORDER.incr('tablize_cells', len(rlist))
     return rlist
 
 
@@ -61,6 +69,9 @@ def tablize(slist, cols, col_ws=[], sep='\t', pad=True, line_prefix=[], line_suf
 
 
 def tprint(slist, cols, col_ws=[], sep='\t', flush=False, pad=True, line_prefix=[], line_suffix=[]):
-    print(tablize(slist, cols, col_ws, sep, pad, line_prefix, line_suffix))
+    table = tablize(slist, cols, col_ws, sep, pad, line_prefix, line_suffix)
+    print(table)
+    if metrics.RECORDER is not None:
+        metrics.RECORDER.record_write(table + '\n')
 
         
@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Rich text made of styled segments.
+
+A `Text` keeps plain text and styles apart, so concatenation, measuring,
+slicing by visible width and re-styling never touch escape codes. Escape
+codes are only produced by `render`, for the requested color depth.
+
+Usage:
+    >>> from xprint.text import Text, Style
+    >>> t = Text('error: ', Style(fg='red', sgr='bold')) + 'file not found'
+    >>> len(t)                      # visible width
+    >>> print(t[:10])               # slice by visible width
+    >>> print(t.overlay(Style(bg=(40, 40, 40)), 7))
+    >>> print(t.render(depth=BIT4))
+"""
+
+from collections import namedtuple
+from typing import Union
+from .ansi_code import ESC, RESET, SGR
+from .colors import (
+    _rgb_code, _parse_color, _resolve_color, _style_key, _as_theme, get_theme,
+    _STYLE_CACHE_SIZE)
+from . import metrics
+
+# ---------------------------------------------
+# Define variables
+# ---------------------------------------------
+
+# color depths
+NO_COLOR = 'none'
+BIT4 = 'bit4'
+TRUECOLOR = 'truecolor'
+
+# depth used by str(text)
+DEFAULT_DEPTH = TRUECOLOR
+
+# fixed rgb of the ansi base colors used to pick the nearest 4 bit color,
+# index is the ansi color code. Registered colors do not change it.
+_ANSI_BASE_RGB = (
+    (0, 0, 0),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (0, 0, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+)
+
+
+def _is_default(color):
+    return color is None or color == '' or color == 'default' or color == ()
+
+
+def _nearest_bit4(color):
+    rgb = _parse_color(color)
+    if not rgb or not rgb.endswith(';'):
+        return ''
+    r, g, b = map(int, rgb[:-1].split(';'))
+    dists = [(r - c[0]) ** 2 + (g - c[1]) ** 2 + (b - c[2]) ** 2 for c in _ANSI_BASE_RGB]
+    return str(dists.index(min(dists)))
+
+
+# ---------------------------------------------
+# style & segment
+# ---------------------------------------------
+
+class Style(namedtuple('Style', ['fg', 'bg', 'sgr'])):
+    """
+    Immutable text style, params same as `colorize`. Equal styles are usually
+    the same object, but the intern table is bounded, so compare with `==`.
+    """
+    __slots__ = ()
+    _interned = {}
+
+    def __new__(cls, fg='default', bg='default', sgr=''):
+        fg = 'default' if _is_default(fg) else _style_key(fg)
+        bg = 'default' if _is_default(bg) else _style_key(bg)
+        sgr = sgr.lower() if sgr else ''
+        key = (fg, bg, sgr)
+        style = cls._interned.get(key)
+        if style is None:
+            if len(cls._interned) >= _STYLE_CACHE_SIZE:
+                cls._interned.clear()
+                cls._interned[('default', 'default', '')] = NULL_STYLE
+            style = cls._interned.setdefault(key, super().__new__(cls, fg, bg, sgr))
+        return style
+
+    def __bool__(self):
+        return self != NULL_STYLE
+
+    def overlay(self, other: 'Style'):
+        """
+        get a style with the non-default fields of `other` on top of this one
+        """
+        if other is None or not other:
+            return self
+        if not self:
+            return other
+        return Style(
+            self.fg if other.fg == 'default' else other.fg,
+            self.bg if other.bg == 'default' else other.bg,
+            other.sgr or self.sgr)
+
+    def code(self, depth: str = TRUECOLOR, theme=None):
+        """
+        get the escape code of the style for a color depth, '' if nothing to apply
+        """
+        if depth == NO_COLOR or not self:
+            return ''
+        theme = get_theme() if theme is None else _as_theme(theme)
+        _, palette, _, cache = theme.state()
+        key = (depth, self)
+        code = cache.get(key)
+        if code is None:
+            fg = _resolve_color(palette, self.fg)
+            bg = _resolve_color(palette, self.bg)
+            if depth == BIT4:
+                sgr_code = SGR.get_code(self.sgr)
+                fg_code = _nearest_bit4(fg)
+                bg_code = _nearest_bit4(bg)
+                parts = [sgr_code, fg_code and '3' + fg_code, bg_code and '4' + bg_code]
+                code = f"{ESC}[{';'.join(p for p in parts if p)}m"
+            else:
+                code = _rgb_code(fg, bg, self.sgr)
+            if len(cache) >= _STYLE_CACHE_SIZE:
+                cache.clear()
+            cache[key] = code
+        return code
+
+
+NULL_STYLE = Style()
+
+Segment = namedtuple('Segment', ['text', 'style'])
+
+
+# ---------------------------------------------
+# text
+# ---------------------------------------------
+
+class Text:
+    """
+    Immutable sequence of styled segments.
+
+    Param:
+        text: plain text
+        style: Style of the text, or None for unstyled text
+
+    `len()` is the visible width. `+` takes Text or str, indexing and slicing
+    work on visible characters and `str()` renders with `DEFAULT_DEPTH`.
+    """
+    __slots__ = ('segments', '_width', '_rendered')
+
+    def __init__(self, text: str = '', style: Style = None):
+        style = NULL_STYLE if style is None else style
+        self.segments = (Segment(text, style),) if text else ()
+        self._width = len(text)
+        self._rendered = None
+
+    @classmethod
+    def from_segments(cls, segments):
+        """
+        build a Text from (text, style) pairs, merging neighbours of the same style
+        """
+        merged = []
+        width = 0
+        for text, style in segments:
+            if not text:
+                continue
+            if style is None:
+                style = NULL_STYLE
+            width += len(text)
+            if merged and (merged[-1].style is style or merged[-1].style == style):
+                merged[-1] = Segment(merged[-1].text + text, style)
+            else:
+                merged.append(Segment(text, style))
+        obj = cls.__new__(cls)
+        obj.segments = tuple(merged)
+        obj._width = width
+        obj._rendered = None
+        return obj
+
+    @property
+    def plain(self):
+        return ''.join(seg.text for seg in self.segments)
+
+    def __len__(self):
+        return self._width
+
+    def __bool__(self):
+        return self._width > 0
+
+    def __eq__(self, other):
+        if isinstance(other, Text):
+            return self.segments == other.segments
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.segments)
+
+    def __repr__(self):
+        return f'Text({list(self.segments)!r})'
+
+    def __add__(self, other: Union['Text', str]):
+        if isinstance(other, str):
+            other = Text(other)
+        elif not isinstance(other, Text):
+            return NotImplemented
+        if not other.segments:
+            return self
+        if not self.segments:
+            return other
+        a, b = self.segments, other.segments
+        if a[-1].style is b[0].style or a[-1].style == b[0].style:
+            segments = a[:-1] + (Segment(a[-1].text + b[0].text, b[0].style),) + b[1:]
+        else:
+            segments = a + b
+        obj = Text.__new__(Text)
+        obj.segments = segments
+        obj._width = self._width + other._width
+        obj._rendered = None
+        return obj
+
+    def __radd__(self, other: str):
+        if isinstance(other, str):
+            return Text(other) + self
+        return NotImplemented
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            if key < 0:
+                key += self._width
+            if not 0 <= key < self._width:
+                raise IndexError('Text index out of range')
+            key = slice(key, key + 1)
+        if not isinstance(key, slice):
+            raise TypeError(f'Text indices must be integers or slices, not {type(key).__name__}')
+        start, stop, step = key.indices(self._width)
+        if step != 1:
+            raise ValueError('Text slicing does not support step.')
+        if start >= stop:
+            return Text()
+        if start == 0 and stop == self._width:
+            return self
+        segments = []
+        pos = 0
+        for text, style in self.segments:
+            end = pos + len(text)
+            if end > start and pos < stop:
+                segments.append((text[max(0, start - pos):stop - pos], style))
+            if end >= stop:
+                break
+            pos = end
+        return Text.from_segments(segments)
+
+    def overlay(self, style: Style, start: int = 0, end: int = None):
+        """
+        Put `style` on top of the styles of [start, end), see `Style.overlay`.
+        """
+        start, end, _ = slice(start, end).indices(self._width)
+        if start >= end:
+            return self
+        segments = []
+        pos = 0
+        for text, st in self.segments:
+            seg_end = pos + len(text)
+            a = min(max(start - pos, 0), len(text))
+            b = min(max(end - pos, 0), len(text))
+            segments.append((text[:a], st))
+            segments.append((text[a:b], st.overlay(style)))
+            segments.append((text[b:], st))
+            pos = seg_end
+        return Text.from_segments(segments)
+
+    def truncate(self, width: int, ellipsis: str = ''):
+        """
+        cut the text to at most `width` visible characters
+        """
+        width = max(0, width)
+        if self._width <= width:
+            return self
+        if ellipsis and width > len(ellipsis):
+            cut = self[:width - len(ellipsis)]
+            return cut + Text(ellipsis, cut.segments[-1].style if cut.segments else None)
+        return self[:width]
+
+    def ljust(self, width: int, fillchar: str = ' '):
+        if self._width >= width:
+            return self
+        return self + fillchar * (width - self._width)
+
+    def render(self, depth: str = None, theme=None):
+        """
+        Render to an escape coded string.
+
+        Args:
+            depth: NO_COLOR, BIT4 or TRUECOLOR. Defaults to `DEFAULT_DEPTH`.
+            theme: Theme used to resolve color names. Defaults to the active theme.
+
+        Unlike `colorize`, color names do not require a 256 color terminal, the
+        depth is chosen by the caller. Use BIT4 for terminals without truecolor.
+        """
+        depth = DEFAULT_DEPTH if depth is None else depth
+        theme = get_theme() if theme is None else _as_theme(theme)
+        state = theme.state()
+        if self._rendered is not None:
+            r_depth, r_state, ret = self._rendered
+            if r_depth == depth and r_state is state:
+                if metrics.RECORDER is not None:
+                    metrics.RECORDER.record_render(self.plain, ret, True)
+                return ret
+        parts = []
+        for text, style in self.segments:
+            code = style.code(depth, theme)
+            if code:
+                parts.append(code)
+                parts.append(text)
+                parts.append(RESET)
+            else:
+                parts.append(text)
+        ret = ''.join(parts)
+        self._rendered = (depth, state, ret)
+        if metrics.RECORDER is not None:
+            metrics.RECORDER.record_render(self.plain, ret, False)
+        return ret
+
+    def __str__(self):
+        return self.render()
+
+    def __format__(self, spec):
+        if not spec:
+            return self.render()
+        return format(self.render(), spec)